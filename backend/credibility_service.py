@@ -1,8 +1,29 @@
-from typing import Dict, List
+import re
+from types import MappingProxyType
+from typing import Dict, List, Mapping
+from urllib.parse import urlparse
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Delimiters that end the host part of a URL: path, query, or fragment
+_HOST_END_RE = re.compile(r'[/?#]')
+
+# Specialization areas for well-known domains; frozen at module scope so
+# no per-call dict construction or accidental mutation
+_SPECIALIZATIONS: Mapping[str, tuple] = MappingProxyType({
+    'factcheck.pib.gov.in': ('Government', 'Politics', 'Health', 'General'),
+    'altnews.in': ('Politics', 'Social Media', 'Religion'),
+    'boomlive.in': ('Politics', 'Health', 'Technology'),
+    'thehindu.com': ('Politics', 'Economy', 'General News'),
+    'ptinews.com': ('General News', 'Breaking News'),
+    'rbi.org.in': ('Finance', 'Banking', 'Economy'),
+    'mohfw.gov.in': ('Health', 'Medical', 'COVID-19'),
+    'eci.gov.in': ('Elections', 'Politics', 'Democracy'),
+})
+_DEFAULT_SPEC = ('General',)
+
+
 class CredibilityService:
     def __init__(self):
         # Predefined credibility scores for known Indian sources
@@ -28,15 +49,46 @@ class CredibilityService:
             'opindia.com': 50,
             'postcard.news': 45,
         }
-    
+        # Exact-match suffix table so lookups are O(labels) hash probes
+        # instead of an O(N) substring scan (which also mis-matched
+        # unrelated domains sharing a tail, e.g. 'le.com' in 'google.com')
+        self._suffix_map = dict(self.source_ratings)
+        # Default scores for known TLD suffixes of otherwise unknown domains
+        self._tld_defaults = {
+            'gov.in': 90,   # Government sources
+            'edu': 85,      # Educational sources
+            'org.in': 75,   # NGO sources
+            'org': 75,
+        }
+        # The trusted-sources list is static for the process lifetime, so
+        # sort and filter once here rather than on every /sources request
+        self._trusted_sources_cached = tuple(
+            {
+                'domain': domain,
+                'credibility_score': score,
+                'specialization': self._get_specialization(domain)
+            }
+            for domain, score in sorted(
+                self.source_ratings.items(), key=lambda x: x[1], reverse=True
+            )
+            if score >= 80  # Only highly trusted
+        )
+
+
     def get_domain_from_url(self, url: str) -> str:
         """
         Extract domain from URL
         """
         try:
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
+            # Fast path for the common scheme://host/... shape; avoids
+            # building a ParseResult per source
+            if '://' in url:
+                # The host ends at the first of '/', '?' or '#' -- a
+                # path-less URL like https://host?ref=x still has a query
+                domain = _HOST_END_RE.split(url.split('://', 1)[1], 1)[0]
+            else:
+                domain = urlparse(f'//{url}').netloc
+            domain = domain.split(':', 1)[0].lower()
             # Remove www.
             if domain.startswith('www.'):
                 domain = domain[4:]
@@ -49,26 +101,27 @@ class CredibilityService:
         Calculate credibility score for a source
         """
         domain = self.get_domain_from_url(source_url)
-        
-        # Check if we have a rating for this domain
-        for known_domain, score in self.source_ratings.items():
-            if known_domain in domain:
+
+        # Walk the domain's labels right-to-left with exact suffix lookups
+        labels = domain.split('.')
+        tld_score = None
+        for i in range(len(labels)):
+            suffix = '.'.join(labels[i:])
+            score = self._suffix_map.get(suffix)
+            if score is not None:
                 logger.info(f"Found credibility score for {domain}: {score}")
                 return score
-        
+            if tld_score is None:
+                tld_score = self._tld_defaults.get(suffix)
+
         # Default credibility for unknown sources
-        default_score = 60
-        
-        # Adjust based on TLD and patterns
-        if domain.endswith('.gov.in'):
-            default_score = 90  # Government sources
-        elif domain.endswith('.edu'):
-            default_score = 85  # Educational sources
-        elif domain.endswith('.org.in') or domain.endswith('.org'):
-            default_score = 75  # NGO sources
+        if tld_score is not None:
+            default_score = tld_score
         elif any(word in domain for word in ['fake', 'satire', 'parody']):
             default_score = 20  # Satirical sources
-        
+        else:
+            default_score = 60
+
         logger.info(f"Using default credibility score for {domain}: {default_score}")
         return default_score
     
@@ -101,28 +154,10 @@ class CredibilityService:
         """
         Return list of trusted sources for display
         """
-        sources = []
-        for domain, score in sorted(self.source_ratings.items(), key=lambda x: x[1], reverse=True):
-            if score >= 80:  # Only highly trusted
-                sources.append({
-                    'domain': domain,
-                    'credibility_score': score,
-                    'specialization': self._get_specialization(domain)
-                })
-        return sources
-    
+        return self._trusted_sources_cached
+
     def _get_specialization(self, domain: str) -> List[str]:
         """
         Get specialization areas for a domain
         """
-        specializations = {
-            'factcheck.pib.gov.in': ['Government', 'Politics', 'Health', 'General'],
-            'altnews.in': ['Politics', 'Social Media', 'Religion'],
-            'boomlive.in': ['Politics', 'Health', 'Technology'],
-            'thehindu.com': ['Politics', 'Economy', 'General News'],
-            'ptinews.com': ['General News', 'Breaking News'],
-            'rbi.org.in': ['Finance', 'Banking', 'Economy'],
-            'mohfw.gov.in': ['Health', 'Medical', 'COVID-19'],
-            'eci.gov.in': ['Elections', 'Politics', 'Democracy'],
-        }
-        return specializations.get(domain, ['General'])
+        return list(_SPECIALIZATIONS.get(domain, _DEFAULT_SPEC))
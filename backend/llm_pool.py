@@ -0,0 +1,40 @@
+import os
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Global cap on concurrent LLM calls so a burst of /verify requests cannot
+# exhaust upstream rate limits and stall every inflight request
+LLM_MAX_CONCURRENCY = int(os.environ.get('LLM_MAX_CONCURRENCY', '16'))
+
+# Ceiling on a single LLM round-trip; keeps one stalled upstream call
+# from holding a request open indefinitely
+LLM_TIMEOUT_SECONDS = float(os.environ.get('LLM_TIMEOUT_SECONDS', '30'))
+
+LLM_MAX_RETRIES = 2
+
+LLM_SEM = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+
+async def send_with_limit(chat, message, timeout: float = None):
+    """
+    Send a message on a chat client under the global concurrency cap,
+    retrying with exponential backoff if the call times out
+    """
+    if timeout is None:
+        timeout = LLM_TIMEOUT_SECONDS
+
+    delay = 1.0
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        try:
+            async with LLM_SEM:
+                return await asyncio.wait_for(chat.send_message(message), timeout=timeout)
+        except asyncio.TimeoutError:
+            if attempt == LLM_MAX_RETRIES:
+                raise
+            logger.warning(
+                f"LLM call timed out after {timeout}s, retrying in {delay}s"
+            )
+            await asyncio.sleep(delay)
+            delay *= 2
@@ -6,7 +6,7 @@ import uuid
 class InputArticle(BaseModel):
     model_config = ConfigDict(extra="ignore")
     
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     input_type: str  # 'text', 'url', 'image'
     content: str  # text content or URL or base64 image
     detected_language: Optional[str] = None
@@ -16,7 +16,7 @@ class InputArticle(BaseModel):
 class Claim(BaseModel):
     model_config = ConfigDict(extra="ignore")
     
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     article_id: str
     claim_text: str
     claim_text_english: Optional[str] = None  # Translated version
@@ -25,6 +25,8 @@ class Claim(BaseModel):
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class SourceEvidence(BaseModel):
+    """Base shape of one evidence entry; the pipeline enriches these
+    dicts with extra keys (stance, reputation_category) before storage"""
     source_name: str
     source_url: str
     relevant_text: str
@@ -34,19 +36,21 @@ class SourceEvidence(BaseModel):
 class VerificationResult(BaseModel):
     model_config = ConfigDict(extra="ignore")
     
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     claim_id: str
     verdict: str  # 'TRUE', 'FALSE', 'MISLEADING', 'UNVERIFIED'
     confidence: float  # 0-100
     explanation: str
-    supporting_sources: List[SourceEvidence] = []
-    contradicting_sources: List[SourceEvidence] = []
+    # Enriched SourceEvidence-shaped dicts; kept as dicts so the extra
+    # reputation fields survive serialization to Mongo and the response
+    supporting_sources: List[Dict[str, Any]] = []
+    contradicting_sources: List[Dict[str, Any]] = []
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class TrustedSource(BaseModel):
     model_config = ConfigDict(extra="ignore")
     
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     name: str
     domain: str
     credibility_score: float  # 0-100
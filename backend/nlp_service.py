@@ -1,68 +1,180 @@
 import os
 import re
+import hashlib
+import itertools
+from collections import OrderedDict
 from typing import List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 from emergentintegrations.llm.chat import LlmChat, UserMessage
+from llm_pool import send_with_limit
 import logging
-import json
+import orjson
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Maximum entries per LRU cache before oldest entries are evicted
+_CACHE_MAX_ENTRIES = 10_000
+
+# Sentence boundary used when deduplicating text before LLM calls;
+# includes the danda terminators used by Devanagari and other Indic scripts
+_SENTENCE_RE = re.compile(r'(?<=[.!?।॥])\s+')
+
+# Monotonic counter for session ids; pid + counter is unique enough and
+# avoids an os.urandom syscall per id
+_SESSION_CTR = itertools.count()
+
+
+def _session_id(prefix: str) -> str:
+    return f"{prefix}-{os.getpid()}-{next(_SESSION_CTR)}"
+
+
+def _text_key(text: str, prefix_chars: Optional[int] = None) -> str:
+    """
+    Stable content hash for a text. Hash the full text by default so
+    distinct texts never collide; pass prefix_chars only when the
+    downstream call itself sends just that prefix to the LLM.
+    """
+    if prefix_chars is not None:
+        text = text[:prefix_chars]
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def _parse_json_array(response: str):
+    """
+    Parse the JSON array in an LLM response, tolerating code fences and
+    surrounding prose via a single bracket scan instead of regex passes
+    """
+    start = response.find('[')
+    end = response.rfind(']')
+    if start == -1 or end <= start:
+        raise orjson.JSONDecodeError('No JSON array in response', response, 0)
+    return orjson.loads(response[start:end + 1])
+
+
 class NLPService:
     def __init__(self):
         self.api_key = os.environ.get('EMERGENT_LLM_KEY', '')
-        
+        # Process-local LRU caches so retries and duplicate submissions
+        # skip the LLM round-trip entirely
+        self._lang_cache: OrderedDict = OrderedDict()
+        self._trans_cache: OrderedDict = OrderedDict()
+
+    def _make_chat(self, prefix: str, system_message: str) -> LlmChat:
+        """
+        Build a chat client with a fresh session for one call. LlmChat may
+        accumulate per-session history, so sessions are never reused
+        across requests; the session id itself is cheap (pid + counter).
+        """
+        return LlmChat(
+            api_key=self.api_key,
+            session_id=_session_id(prefix),
+            system_message=system_message
+        ).with_model("openai", "gpt-5.2")
+
+    @staticmethod
+    def _prepare_text(text: str, max_chars: int = 8000) -> str:
+        """
+        Drop repeated sentences and cap total length before sending text
+        to the LLM; token cost and latency scale with input size
+        """
+        sentences = _SENTENCE_RE.split(text)
+        seen = set()
+        kept = []
+        total = 0
+        for sentence in sentences:
+            key = hash(sentence)
+            if key in seen:
+                continue
+            seen.add(key)
+            total += len(sentence) + 1
+            if total > max_chars:
+                break
+            kept.append(sentence)
+        if not kept:
+            # Nothing fit under the cap (e.g. a single run-on sentence the
+            # boundary regex could not split); a hard truncation beats
+            # sending the LLM an empty string
+            return text[:max_chars]
+        return ' '.join(kept)
+
+    @staticmethod
+    def _cache_get(cache: OrderedDict, key):
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+    @staticmethod
+    def _cache_put(cache: OrderedDict, key, value):
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > _CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+
     async def detect_language(self, text: str) -> str:
         """
         Detect language of input text
         """
+        # Keyed on the 500-char prefix because that is all the prompt sends
+        cache_key = _text_key(text, prefix_chars=500)
+        cached = self._cache_get(self._lang_cache, cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            chat = LlmChat(
-                api_key=self.api_key,
-                session_id=f"lang-detect-{os.urandom(8).hex()}",
-                system_message="You are a language detection system. Identify the primary language of the text."
-            ).with_model("openai", "gpt-5.2")
-            
+            chat = self._make_chat(
+                "lang-detect",
+                "You are a language detection system. Identify the primary language of the text."
+            )
+
             message = UserMessage(
                 text=f"""Identify the primary language of this text. Respond with ONLY the language name (e.g., 'Hindi', 'English', 'Tamil', 'Telugu', 'Bengali', 'Kannada', 'Malayalam', 'Marathi', or 'Mixed').
 
 Text: {text[:500]}"""
             )
-            
-            response = await chat.send_message(message)
+
+            response = await send_with_limit(chat, message)
             detected = response.strip() if response else "English"
             logger.info(f"Detected language: {detected}")
+            self._cache_put(self._lang_cache, cache_key, detected)
             return detected
-            
+
         except Exception as e:
             logger.error(f"Language detection failed: {str(e)}")
             return "English"
-    
+
     async def translate_to_english(self, text: str, source_language: str) -> str:
         """
         Translate regional text to English
         """
         if source_language.lower() == 'english':
             return text
-            
+
+        text = self._prepare_text(text)
+        cache_key = (_text_key(text), source_language.lower())
+        cached = self._cache_get(self._trans_cache, cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            chat = LlmChat(
-                api_key=self.api_key,
-                session_id=f"translate-{os.urandom(8).hex()}",
-                system_message="You are a professional translator specializing in Indian languages."
-            ).with_model("openai", "gpt-5.2")
-            
+            chat = self._make_chat(
+                "translate",
+                "You are a professional translator specializing in Indian languages."
+            )
+
             message = UserMessage(
                 text=f"""Translate the following {source_language} text to English. Maintain the meaning and context accurately. Return ONLY the translated text.
 
 Text: {text}"""
             )
-            
-            response = await chat.send_message(message)
+
+            response = await send_with_limit(chat, message)
             if response:
                 logger.info(f"Translated text from {source_language} to English")
-                return response.strip()
+                translated = response.strip()
+                self._cache_put(self._trans_cache, cache_key, translated)
+                return translated
             return text
             
         except Exception as e:
@@ -73,84 +185,104 @@ Text: {text}"""
         """
         Extract atomic factual claims from text
         """
+        results = await self.extract_claims_batch([text])
+        return results[0] if results else []
+
+    async def extract_claims_batch(self, texts: List[str]) -> List[List[Dict[str, any]]]:
+        """
+        Extract atomic factual claims from one or more texts in a single LLM call
+        """
         try:
-            chat = LlmChat(
-                api_key=self.api_key,
-                session_id=f"claims-{os.urandom(8).hex()}",
-                system_message="You are a fact-checking expert that extracts verifiable claims from news articles."
-            ).with_model("openai", "gpt-5.2")
-            
+            chat = self._make_chat(
+                "claims",
+                "You are a fact-checking expert that extracts verifiable claims from news articles."
+            )
+
+            texts = [self._prepare_text(text) for text in texts]
+            numbered_texts = '\n\n'.join(
+                f"Text {i + 1}:\n{text}" for i, text in enumerate(texts)
+            )
+
             message = UserMessage(
-                text=f"""Extract all factual claims from this text that can be verified. Ignore opinions and satire.
+                text=f"""Extract all factual claims that can be verified from each of the {len(texts)} texts below. Ignore opinions and satire.
 
 For each claim, provide:
 1. The claim text
 2. Claim type ('factual', 'opinion', or 'satire')
 3. Key entities mentioned (people, places, organizations, dates)
 
-Return as JSON array:
+Return a JSON array with one element per input text, in order:
 [
-  {{
-    "claim_text": "specific factual statement",
-    "claim_type": "factual",
-    "entities": [{{"type": "person", "value": "Name"}}]
-  }}
+  [
+    {{
+      "claim_text": "specific factual statement",
+      "claim_type": "factual",
+      "entities": [{{"type": "person", "value": "Name"}}]
+    }}
+  ]
 ]
 
-Text:
-{text}
+{numbered_texts}
 
 Return ONLY the JSON array, no other text."""
             )
-            
-            response = await chat.send_message(message)
-            
+
+            response = await send_with_limit(chat, message)
+
             if response:
                 # Try to extract JSON from response
                 try:
-                    # Remove markdown code blocks if present
-                    json_text = response.strip()
-                    if json_text.startswith('```'):
-                        json_text = re.sub(r'^```(?:json)?\n', '', json_text)
-                        json_text = re.sub(r'\n```$', '', json_text)
-                    
-                    claims_data = json.loads(json_text)
-                    
+                    claims_data = _parse_json_array(response)
+
+                    # The model may return a flat claim array for a single text
+                    if claims_data and isinstance(claims_data[0], dict):
+                        claims_data = [claims_data]
+
+                    # Pad in case the model dropped trailing empty texts
+                    claims_data += [[] for _ in range(len(texts) - len(claims_data))]
+
                     # Filter only factual claims
                     factual_claims = [
-                        claim for claim in claims_data 
-                        if claim.get('claim_type') == 'factual'
+                        [
+                            claim for claim in text_claims
+                            if claim.get('claim_type') == 'factual'
+                        ]
+                        for text_claims in claims_data[:len(texts)]
                     ]
-                    
-                    logger.info(f"Extracted {len(factual_claims)} factual claims")
+
+                    total = sum(len(c) for c in factual_claims)
+                    logger.info(f"Extracted {total} factual claims from {len(texts)} texts")
                     return factual_claims
-                    
-                except json.JSONDecodeError as je:
+
+                except orjson.JSONDecodeError as je:
                     logger.error(f"Failed to parse claims JSON: {je}")
-                    # Fallback: treat entire text as one claim
-                    return [{
-                        "claim_text": text[:500],
-                        "claim_type": "factual",
-                        "entities": []
-                    }]
-            
-            return []
-            
+                    # Fallback: treat each entire text as one claim
+                    return [
+                        [{
+                            "claim_text": text[:500],
+                            "claim_type": "factual",
+                            "entities": []
+                        }]
+                        for text in texts
+                    ]
+
+            return [[] for _ in texts]
+
         except Exception as e:
             logger.error(f"Claim extraction failed: {str(e)}")
-            return []
+            return [[] for _ in texts]
     
     async def extract_named_entities(self, text: str) -> List[Dict[str, str]]:
         """
         Extract named entities from text
         """
         try:
-            chat = LlmChat(
-                api_key=self.api_key,
-                session_id=f"ner-{os.urandom(8).hex()}",
-                system_message="You are a named entity recognition system."
-            ).with_model("openai", "gpt-5.2")
-            
+            chat = self._make_chat(
+                "ner",
+                "You are a named entity recognition system."
+            )
+
+            text = self._prepare_text(text)
             message = UserMessage(
                 text=f"""Extract all named entities from this text. Return as JSON array with type and value:
 [
@@ -164,20 +296,15 @@ Text: {text}
 
 Return ONLY the JSON array."""
             )
-            
-            response = await chat.send_message(message)
-            
+
+            response = await send_with_limit(chat, message)
+
             if response:
                 try:
-                    json_text = response.strip()
-                    if json_text.startswith('```'):
-                        json_text = re.sub(r'^```(?:json)?\n', '', json_text)
-                        json_text = re.sub(r'\n```$', '', json_text)
-                    
-                    entities = json.loads(json_text)
+                    entities = _parse_json_array(response)
                     logger.info(f"Extracted {len(entities)} entities")
                     return entities
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     logger.error("Failed to parse entities JSON")
                     return []
             
@@ -1,29 +1,50 @@
 import os
-import base64
+import re
+import itertools
 from typing import Optional
 from dotenv import load_dotenv
 from emergentintegrations.llm.chat import LlmChat, UserMessage, ImageContent
+from llm_pool import send_with_limit
 import logging
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Monotonic counter for session ids; pid + counter is unique enough and
+# avoids an os.urandom syscall per id
+_SESSION_CTR = itertools.count()
+
 class OCRService:
+    # Base64 alphabet check applied to a prefix; avoids decoding the
+    # whole payload just to validate it
+    _B64_RE = re.compile(rb'^[A-Za-z0-9+/]+=*$')
+    # Reject payloads above ~10MB of base64 before any LLM call
+    MAX_IMAGE_B64_LEN = 10_000_000
+
     def __init__(self):
         self.api_key = os.environ.get('EMERGENT_LLM_KEY', '')
-        
+
+    def _make_chat(self) -> LlmChat:
+        """
+        Build a chat client with a fresh session for one OCR call; LlmChat
+        may accumulate per-session history, so sessions are not shared
+        across requests
+        """
+        return LlmChat(
+            api_key=self.api_key,
+            session_id=f"ocr-{os.getpid()}-{next(_SESSION_CTR)}",
+            system_message="You are an OCR system that extracts text from images accurately. Extract all visible text including any Indian language content."
+        ).with_model("openai", "gpt-5.2")
+
     async def extract_text_from_image(self, image_base64: str) -> Optional[str]:
         """
         Extract text from image using OpenAI Vision API
         """
+        if not self.is_valid_image_base64(image_base64):
+            logger.warning("Rejected invalid or oversized image payload")
+            return None
+
         try:
-            # Create chat instance for this request
-            chat = LlmChat(
-                api_key=self.api_key,
-                session_id=f"ocr-{os.urandom(8).hex()}",
-                system_message="You are an OCR system that extracts text from images accurately. Extract all visible text including any Indian language content."
-            ).with_model("openai", "gpt-5.2")
-            
             # Create image content
             image_content = ImageContent(image_base64=image_base64)
             
@@ -34,7 +55,7 @@ class OCRService:
             )
             
             # Send and get response
-            response = await chat.send_message(message)
+            response = await send_with_limit(self._make_chat(), message)
             
             if response:
                 logger.info(f"OCR extracted text length: {len(response)}")
@@ -49,14 +70,14 @@ class OCRService:
     
     def is_valid_image_base64(self, data: str) -> bool:
         """
-        Validate if string is valid base64 image
+        Validate if string is plausibly a base64 image without decoding it
         """
-        try:
-            # Check if it starts with data:image prefix
-            if data.startswith('data:image/'):
-                return True
-            # Try to decode
-            base64.b64decode(data)
-            return True
-        except Exception:
+        if len(data) > self.MAX_IMAGE_B64_LEN:
             return False
+        # Check if it starts with data:image prefix
+        if data.startswith('data:image/'):
+            return True
+        # Length and alphabet check on a prefix instead of a full decode,
+        # which would allocate the entire decoded payload only to discard it
+        encoded = data.encode('ascii', 'ignore')
+        return len(encoded) % 4 == 0 and bool(self._B64_RE.match(encoded[:1024]))
@@ -2,8 +2,11 @@ from fastapi import FastAPI, APIRouter, HTTPException
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
 import os
+import uuid
 import logging
+from collections import Counter
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import List
@@ -38,6 +41,9 @@ app = FastAPI(title="SATYA-VERIFY API", version="1.0.0")
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
+# Verdict values tracked by the stats endpoint
+_VERDICT_KEYS = ('TRUE', 'FALSE', 'MISLEADING', 'UNVERIFIED')
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -86,18 +92,26 @@ async def verify_content(request: VerificationRequest):
         if not text_to_analyze or len(text_to_analyze.strip()) < 10:
             raise HTTPException(status_code=400, detail="Content too short to analyze")
         
-        # Step 2: Detect language
-        detected_language = await nlp_service.detect_language(text_to_analyze)
+        # Step 2: Detect language, speculatively extracting claims in parallel.
+        # Both are independent LLM calls, so overlap them; if the text turns out
+        # to be non-English we discard the speculative result and re-extract
+        # after translation.
+        lang_task = asyncio.create_task(nlp_service.detect_language(text_to_analyze))
+        claims_task = asyncio.create_task(nlp_service.extract_claims(text_to_analyze))
+
+        detected_language = await lang_task
         logger.info(f"Detected language: {detected_language}")
-        
+
         # Step 3: Translate to English if needed
         original_text = text_to_analyze
         if detected_language.lower() != 'english':
+            claims_task.cancel()
             text_to_analyze = await nlp_service.translate_to_english(
-                text_to_analyze, 
+                text_to_analyze,
                 detected_language
             )
             logger.info("Translated content to English")
+            claims_task = asyncio.create_task(nlp_service.extract_claims(text_to_analyze))
         
         # Step 4: Save article to database
         article = InputArticle(
@@ -107,13 +121,16 @@ async def verify_content(request: VerificationRequest):
             original_text=original_text
         )
         
+        # Timestamps stay native datetimes so Mongo stores BSON dates,
+        # letting /history sort on an index instead of lex-comparing strings.
+        # Inserts run as background tasks so DB round-trips overlap the LLM
+        # work; they are awaited together before the response goes out.
         article_dict = article.model_dump()
-        article_dict['timestamp'] = article_dict['timestamp'].isoformat()
-        await db.articles.insert_one(article_dict)
-        logger.info(f"Saved article to database: {article.id}")
+        pending_inserts = [asyncio.create_task(db.articles.insert_one(article_dict))]
+        logger.info(f"Saving article to database: {article.id}")
         
         # Step 5: Extract claims
-        claims_data = await nlp_service.extract_claims(text_to_analyze)
+        claims_data = await claims_task
         logger.info(f"Extracted {len(claims_data)} claims")
         
         if not claims_data:
@@ -124,77 +141,112 @@ async def verify_content(request: VerificationRequest):
                 'entities': []
             }]
         
-        # Step 6: Verify each claim
-        verified_claims = []
-        
-        for claim_data in claims_data[:5]:  # Limit to 5 claims for MVP
-            # Create claim object
-            claim = Claim(
+        # Step 6: Verify claims concurrently (each verification is LLM-bound)
+        async def verify_one(claim_data):
+            # Create claim object. The claim data is our own parsed LLM
+            # output, so skip pydantic validation with model_construct;
+            # full validation stays at the request boundary.
+            claim = Claim.model_construct(
+                id=uuid.uuid4().hex,
                 article_id=article.id,
                 claim_text=claim_data.get('claim_text', ''),
                 claim_text_english=claim_data.get('claim_text', ''),
-                entities=claim_data.get('entities', []),
-                claim_type=claim_data.get('claim_type', 'factual')
+                entities=claim_data.get('entities', []) or [],
+                claim_type=claim_data.get('claim_type', 'factual'),
+                timestamp=datetime.now(timezone.utc)
             )
-            
-            # Save claim to database
-            claim_dict = claim.model_dump()
-            claim_dict['timestamp'] = claim_dict['timestamp'].isoformat()
-            await db.claims.insert_one(claim_dict)
-            
+
             # Verify the claim
             verification_result = await verification_service.verify_claim(
                 claim.claim_text,
                 claim.id
             )
-            
-            # Enhance sources with credibility data
-            for source in verification_result.get('supporting_sources', []):
+
+            # Enhance sources with credibility data; analyze_source_reputation
+            # returns an enriched copy, so consume it (the old loop threw the
+            # enriched data away)
+            supporting_sources = [
                 credibility_service.analyze_source_reputation(source)
-            
-            for source in verification_result.get('contradicting_sources', []):
+                for source in verification_result.get('supporting_sources', [])
+            ]
+            contradicting_sources = [
                 credibility_service.analyze_source_reputation(source)
-            
-            # Save verification result
-            result = VerificationResult(
+                for source in verification_result.get('contradicting_sources', [])
+            ]
+
+            result = VerificationResult.model_construct(
+                id=uuid.uuid4().hex,
                 claim_id=claim.id,
                 verdict=verification_result.get('verdict', 'UNVERIFIED'),
                 confidence=verification_result.get('confidence', 0),
                 explanation=verification_result.get('explanation', ''),
-                supporting_sources=verification_result.get('supporting_sources', []),
-                contradicting_sources=verification_result.get('contradicting_sources', [])
+                supporting_sources=supporting_sources,
+                contradicting_sources=contradicting_sources,
+                timestamp=datetime.now(timezone.utc)
             )
-            
+
+            return claim, result
+
+        # Limit to 5 claims for MVP
+        verified = await asyncio.gather(
+            *[verify_one(claim_data) for claim_data in claims_data[:5]]
+        )
+
+        # Save claims and results in two batched inserts instead of one
+        # round-trip per document
+        verified_claims = []
+        claim_dicts = []
+        result_dicts = []
+
+        for claim, result in verified:
+            claim_dicts.append(claim.model_dump())
+
+            # Dump each result once and reuse the dict for both the DB
+            # payload and the response entry instead of re-walking the model
             result_dict = result.model_dump()
-            result_dict['timestamp'] = result_dict['timestamp'].isoformat()
-            await db.verification_results.insert_one(result_dict)
-            
+            result_dicts.append(result_dict)
+
             verified_claims.append({
                 'claim_id': claim.id,
                 'claim_text': claim.claim_text,
-                'verdict': result.verdict,
-                'confidence': result.confidence,
-                'explanation': result.explanation,
-                'supporting_sources': result.supporting_sources,
-                'contradicting_sources': result.contradicting_sources
+                'verdict': result_dict['verdict'],
+                'confidence': result_dict['confidence'],
+                'explanation': result_dict['explanation'],
+                'supporting_sources': result_dict['supporting_sources'],
+                'contradicting_sources': result_dict['contradicting_sources']
             })
+
+        if claim_dicts:
+            pending_inserts.append(
+                asyncio.create_task(db.claims.insert_many(claim_dicts))
+            )
+            pending_inserts.append(
+                asyncio.create_task(db.verification_results.insert_many(result_dicts))
+            )
         
-        # Step 7: Generate overall assessment
-        verdicts = [c['verdict'] for c in verified_claims]
-        false_count = verdicts.count('FALSE')
-        misleading_count = verdicts.count('MISLEADING')
-        
-        if false_count > len(verdicts) / 2:
+        # Step 7: Generate overall assessment (one Counter pass instead of
+        # a list scan per verdict)
+        verdict_tally = Counter(c['verdict'] for c in verified_claims)
+        half = len(verified_claims) // 2
+        false_count = verdict_tally['FALSE']
+        misleading_count = verdict_tally['MISLEADING']
+
+        if false_count > half:
             overall = "This content contains multiple false claims and is likely misinformation."
-        elif false_count + misleading_count > len(verdicts) / 2:
+        elif false_count + misleading_count > half:
             overall = "This content contains misleading or false information."
-        elif verdicts.count('TRUE') > len(verdicts) / 2:
+        elif verdict_tally['TRUE'] > half:
             overall = "This content appears to be largely factual based on available evidence."
         else:
             overall = "Unable to fully verify this content. Some claims lack sufficient evidence."
         
         logger.info(f"Verification complete. Overall: {overall}")
-        
+
+        # Flush pending writes; a failed insert should not fail the response
+        for insert_result in await asyncio.gather(*pending_inserts, return_exceptions=True):
+            if isinstance(insert_result, Exception):
+                logger.error(f"Background insert failed: {insert_result}")
+
         return VerificationResponse(
             article_id=article.id,
             detected_language=detected_language,
@@ -247,28 +299,24 @@ async def get_statistics():
     Get platform statistics
     """
     try:
-        total_articles = await db.articles.count_documents({})
-        total_claims = await db.claims.count_documents({})
-        total_verifications = await db.verification_results.count_documents({})
-        
-        # Verdict distribution
-        verdicts = await db.verification_results.find(
-            {}, 
-            {"verdict": 1, "_id": 0}
-        ).to_list(1000)
-        
-        verdict_counts = {
-            'TRUE': 0,
-            'FALSE': 0,
-            'MISLEADING': 0,
-            'UNVERIFIED': 0
-        }
-        
-        for v in verdicts:
-            verdict = v.get('verdict', 'UNVERIFIED')
-            if verdict in verdict_counts:
-                verdict_counts[verdict] += 1
+        # Issue the three counts concurrently; estimated_document_count
+        # reads collection metadata instead of scanning documents
+        total_articles, total_claims, total_verifications = await asyncio.gather(
+            db.articles.estimated_document_count(),
+            db.claims.estimated_document_count(),
+            db.verification_results.estimated_document_count(),
+        )
         
+        # Verdict distribution, grouped server-side so only one document
+        # per verdict crosses the wire instead of the whole collection
+        pipeline = [{"$group": {"_id": "$verdict", "n": {"$sum": 1}}}]
+
+        verdict_counts = {key: 0 for key in _VERDICT_KEYS}
+
+        async for row in db.verification_results.aggregate(pipeline):
+            if row['_id'] in verdict_counts:
+                verdict_counts[row['_id']] = row['n']
+
         return {
             "total_articles": total_articles,
             "total_claims": total_claims,
@@ -291,6 +339,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def create_indexes():
+    await db.verification_results.create_index("verdict")
+    await db.articles.create_index([("timestamp", -1)])
+    await db.claims.create_index([("timestamp", -1)])
+    await db.verification_results.create_index([("timestamp", -1)])
+
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()